@@ -7,28 +7,61 @@ Advanced terminal-based quiz:
 - Randomized questions/options
 - Difficulty levels
 - Optional timed questions (Unix only)
-- Stores scores to quiz_scores.json (leaderboard)
+- Stores scores to quiz_scores.jsonl (leaderboard, one JSON entry per line)
 - Easy to extend with external question bank (see QUESTIONS list)
 """
 
+import heapq
 import json
 import os
 import random
+import select
 import sys
 import time
-import datetime
 import platform
+from collections import namedtuple
 
-# Optional colored output (nice but optional)
+_IS_WINDOWS = platform.system() == "Windows"
+
+
+# Optional colored output (nice but optional). Colors start as no-ops and
+# _init_colors() swaps in colorama lazily, so importing this module (or
+# bailing out before the quiz) never pays colorama's startup cost.
+class _C:
+    def __getattr__(self, _): return ""
+Fore = Style = _C()
+
+
+def _init_colors():
+    global Fore, Style
+    try:
+        import colorama
+        colorama.init(autoreset=True)
+        Fore, Style = colorama.Fore, colorama.Style
+    except Exception:
+        pass
+
+# Optional faster JSON codec (C extension, ~2-6x on decode); stdlib fallback
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj):
+        return orjson.dumps(obj).decode()
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(obj):
+        return json.dumps(obj, ensure_ascii=False)
+
+# Optional NumPy, used only to speed up top-N selection on big leaderboards
 try:
-    from colorama import init as colorama_init, Fore, Style
-    colorama_init(autoreset=True)
-except Exception:
-    class _C:
-        def __getattr__(self, _): return ""
-    Fore = Style = _C()
+    import numpy as np
+except ImportError:
+    np = None
 
-SCORES_FILE = "quiz_scores.json"
+SCORES_FILE = "quiz_scores.jsonl"
 
 # ---- Sample question bank (replace / load from JSON/CSV if you want) ----
 QUESTIONS = [
@@ -88,90 +121,187 @@ QUESTIONS = [
     },
 ]
 
-# ---- Utility: timed input (Unix-only using signal). Fallback to normal input on Windows ----
+# The raw dicts above stay easy to edit/extend, but everything derivable
+# from them is cooked exactly once, at import time: namedtuples for
+# C-level attribute access, interned strings and the lowercase text-match
+# dict, plus the difficulty bucket index. The quiz loop itself does no
+# per-run rebuilding.
+Question = namedtuple("Question", "q choices answer difficulty choices_map")
+
+
+def _preprocess(raw):
+    # Intern the choice strings and reuse the choice object as the answer,
+    # so answer checks are a pointer comparison (is) rather than a memcmp.
+    choices = [sys.intern(c) for c in raw["choices"]]
+    answer = choices[choices.index(raw["answer"])]
+    return Question(
+        q=raw["q"],
+        choices=choices,
+        answer=answer,
+        difficulty=raw.get("difficulty"),
+        choices_map={c.lower(): c for c in choices},
+    )
+
+
+_COOKED = [_preprocess(q) for q in QUESTIONS]
+
+_BUCKETS = {"all": _COOKED, "easy": [], "medium": [], "hard": []}
+for _q in _COOKED:
+    _BUCKETS.setdefault(_q.difficulty, []).append(_q)
+del _q
+
+# ---- Utility: fast in-place shuffle ----
+_rng = random.Random()
+
+
+def fast_shuffle(seq):
+    """
+    In-place Fisher-Yates shuffle.
+
+    Maps one 64-bit random draw onto each bounded index with a
+    multiply-and-shift (Lemire's method) instead of random.shuffle's
+    rejection sampling and division per index.
+    """
+    getrandbits = _rng.getrandbits
+    for i in range(len(seq) - 1, 0, -1):
+        j = (getrandbits(64) * (i + 1)) >> 64
+        seq[i], seq[j] = seq[j], seq[i]
+
+
+# ---- Utility: timed input (POSIX-only using select). Fallback to normal input on Windows ----
 def timed_input(prompt, timeout):
     """
     Returns input string if user types within timeout seconds.
-    If platform doesn't support alarm (Windows), returns normal input (no timeout).
+    If platform doesn't support select on stdin (Windows), returns normal
+    input (no timeout).
     """
-    if platform.system() == "Windows":
+    if _IS_WINDOWS:
         # Windows: fallback to normal input (no reliable cross-platform builtin)
         return input(prompt)
-    else:
-        import signal
+    # Wait on stdin with select instead of SIGALRM: no per-question signal
+    # handler churn, no process-wide signal state touched.
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    ready, _, _ = select.select([sys.stdin], [], [], timeout)
+    if not ready:
+        print("\n" + Fore.YELLOW + "Time's up!")
+        return None
+    return sys.stdin.readline().rstrip("\n")
 
-        def handler(signum, frame):
-            raise TimeoutError
 
-        old = signal.signal(signal.SIGALRM, handler)
-        signal.alarm(timeout)
-        try:
-            val = input(prompt)
-            signal.alarm(0)
-            return val
-        except TimeoutError:
-            print("\n" + Fore.YELLOW + "Time's up!")
-            return None
-        finally:
-            signal.signal(signal.SIGALRM, old)
+# ---- Persistence functions ----
+# Scores are read from disk once per session and kept in memory after that,
+# so saving a result doesn't have to re-read and re-parse the whole file.
+_scores_cache = None
 
 
-# ---- Persistence functions ----
 def load_scores():
+    global _scores_cache
+    if _scores_cache is not None:
+        return _scores_cache
     if os.path.exists(SCORES_FILE):
         try:
             with open(SCORES_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
+                _scores_cache = [_loads(line) for line in f if line.strip()]
         except Exception:
-            return []
-    return []
+            _scores_cache = []
+    else:
+        _scores_cache = []
+    return _scores_cache
+
+
+def iter_scores():
+    """Yield score entries one line at a time without materializing the list."""
+    if not os.path.exists(SCORES_FILE):
+        return
+    try:
+        with open(SCORES_FILE, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield _loads(line)
+    except Exception:
+        return
 
 
 def save_score(entry):
-    data = load_scores()
-    data.append(entry)
-    with open(SCORES_FILE, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
+    # JSON Lines lets a save append a single line instead of
+    # re-serializing and rewriting every previous entry.
+    load_scores().append(entry)
+    with open(SCORES_FILE, "a", encoding="utf-8") as f:
+        f.write(_dumps(entry) + "\n")
+
+
+# Cached top-N view of the leaderboard, invalidated when the scores file
+# changes on disk (mtime check), so repeated displays skip the selection.
+_lb_cache = {"mtime": None, "top_n": None, "top": None}
 
 
 def show_leaderboard(top_n=5):
-    data = load_scores()
-    if not data:
+    try:
+        mtime = os.path.getmtime(SCORES_FILE)
+    except OSError:
+        mtime = None
+    if mtime is None or mtime != _lb_cache["mtime"] or top_n != _lb_cache["top_n"]:
+        # Only the top_n entries are shown, so feed a partial selection:
+        # O(N log top_n) time. Prefer the in-memory score list (save_score
+        # keeps it in sync), so a quiz followed by the leaderboard in the
+        # same session never re-parses the file; otherwise stream entries
+        # straight off disk in O(top_n) memory.
+        source = _scores_cache if _scores_cache is not None else iter_scores()
+        if np is not None and isinstance(source, list) and len(source) > 1000 > top_n:
+            # With thousands of entries, nlargest pays a Python lambda call
+            # per comparison. argpartition selects the top_n indices in
+            # O(N) over a contiguous float64 array; only those few entries
+            # then need a real sort.
+            pct = np.fromiter((e.get("percentage", 0.0) for e in source), dtype=np.float64, count=len(source))
+            idx = np.argpartition(-pct, top_n)[:top_n]
+            top = sorted((source[i] for i in idx), key=lambda e: e.get("percentage", 0), reverse=True)
+        else:
+            top = heapq.nlargest(top_n, source, key=lambda x: x.get("percentage", 0))
+        _lb_cache["top"] = top
+        _lb_cache["mtime"] = mtime
+        _lb_cache["top_n"] = top_n
+    top = _lb_cache["top"]
+    if not top:
         print(Fore.CYAN + "No previous results found.")
         return
-    data_sorted = sorted(data, key=lambda x: x.get("percentage", 0), reverse=True)
-    print(Fore.GREEN + f"\nTop {min(top_n, len(data_sorted))} Leaderboard:")
-    for i, e in enumerate(data_sorted[:top_n], start=1):
+    print(Fore.GREEN + f"\nTop {len(top)} Leaderboard:")
+    for i, e in enumerate(top, start=1):
         time_str = e.get("timestamp", "unknown time")
         print(f"{i}. {e['user']} — {e['score']}/{e['total']} ({e['percentage']:.2f}%) — {time_str}")
 
 
 # ---- Core quiz logic ----
-def run_quiz(user, difficulty="all", timed=False, per_question_time=15, num_questions=None):
+def run_quiz(user, difficulty="all", timed=False, per_question_time=15, num_questions=None, pause=0.0):
     # Filter questions by difficulty
-    pool = [q.copy() for q in QUESTIONS if difficulty == "all" or q.get("difficulty") == difficulty]
+    # Questions are immutable; the only thing mutated per question is the
+    # choices list, which is copied inside the loop before shuffling.
+    pool = list(_BUCKETS.get(difficulty, ()))
     if not pool:
         print(Fore.RED + "No questions match that difficulty.")
         return
 
-    random.shuffle(pool)
+    fast_shuffle(pool)
     if num_questions:
         pool = pool[:num_questions]
 
     total = len(pool)
     score = 0
-    details = []
+    # total is known up front, so preallocate instead of growing via append
+    details = [None] * total
 
     print(Fore.CYAN + f"Starting quiz for {user} — {total} questions. Timed mode: {timed}.\n")
 
     for i, q in enumerate(pool, start=1):
         # shuffle choices
-        choices = q["choices"].copy()
-        random.shuffle(choices)
+        choices = q.choices.copy()
+        fast_shuffle(choices)
 
-        print(Style.BRIGHT + f"Q{i}/{total}: {q['q']}")
-        for idx, ch in enumerate(choices, start=1):
-            print(f"  {idx}. {ch}")
+        # emit the question block as one write instead of a syscall per line
+        lines = [Style.BRIGHT + f"Q{i}/{total}: {q.q}" + Style.RESET_ALL]
+        lines.extend(f"  {idx}. {ch}" for idx, ch in enumerate(choices, start=1))
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
 
         # get answer (timed or not)
         prompt = f"Your answer (1-{len(choices)}): "
@@ -192,37 +322,44 @@ def run_quiz(user, difficulty="all", timed=False, per_question_time=15, num_ques
             idx = int(user_choice) - 1
             if 0 <= idx < len(choices):
                 chosen_text = choices[idx]
-                correct = (chosen_text == q["answer"])
+                # chosen_text is always one of q.choices' interned strings,
+                # so identity comparison is safe here
+                correct = (chosen_text is q.answer)
         else:
-            # allow direct text match fallback
+            # allow direct text match fallback (case-insensitive, via the
+            # precomputed lowercase -> choice dict: one O(1) hash lookup)
             if user_choice:
-                user_choice_text = user_choice.lower()
-                for ch in choices:
-                    if ch.lower() == user_choice_text:
-                        chosen_text = ch
-                        correct = (ch == q["answer"])
-                        break
+                chosen_text = q.choices_map.get(user_choice.lower())
+                if chosen_text is not None:
+                    correct = (chosen_text is q.answer)
 
         if correct:
             print(Fore.GREEN + "✔ Correct!\n")
             score += 1
-            details.append({"question": q["q"], "your": chosen_text, "correct": q["answer"], "result": "correct"})
+            details[i - 1] = {"question": q.q, "your": chosen_text, "correct": q.answer, "result": "correct"}
         else:
-            print(Fore.RED + f"✖ Incorrect. Correct answer: {q['answer']}\n")
-            details.append({"question": q["q"], "your": chosen_text if chosen_text else "No valid answer", "correct": q["answer"], "result": "incorrect"})
+            print(Fore.RED + f"✖ Incorrect. Correct answer: {q.answer}\n")
+            details[i - 1] = {"question": q.q, "your": chosen_text if chosen_text else "No valid answer", "correct": q.answer, "result": "incorrect"}
 
-        # small pause to improve UX
-        time.sleep(0.5)
+        # optional pause between questions (off by default so scripted
+        # runs aren't slowed by sleeps)
+        if pause:
+            time.sleep(pause)
 
     percentage = (score / total) * 100 if total else 0.0
 
-    print(Style.BRIGHT + Fore.BLUE + "\nQuiz Completed!")
-    print(f"Score: {score}/{total}")
-    print(f"Percentage: {percentage:.2f}%")
     accuracy = sum(1 for d in details if d["result"] == "correct") / total * 100
-    print(f"Accuracy: {accuracy:.2f}%")
-
-    # Save result
+    sys.stdout.write("\n".join([
+        Style.BRIGHT + Fore.BLUE + "\nQuiz Completed!" + Style.RESET_ALL,
+        f"Score: {score}/{total}",
+        f"Percentage: {percentage:.2f}%",
+        f"Accuracy: {accuracy:.2f}%",
+    ]) + "\n")
+    sys.stdout.flush()
+
+    # Save result (datetime is imported here, not at module scope: it is
+    # only needed for the timestamp, and lazy-loading it shortens startup)
+    import datetime
     entry = {
         "user": user,
         "score": score,
@@ -238,6 +375,7 @@ def run_quiz(user, difficulty="all", timed=False, per_question_time=15, num_ques
 
 # ---- Interactive launcher ----
 def main():
+    _init_colors()
     print(Style.BRIGHT + "Welcome to the Advanced Quiz!\n")
 
     user = input("Enter your name (or nickname): ").strip() or "Anonymous"
@@ -253,15 +391,15 @@ def main():
     timed = tm == "y"
 
     per_q_time = 15
-    if timed and platform.system() != "Windows":
+    if timed and not _IS_WINDOWS:
         tval = input(f"Seconds per question (default {per_q_time}): ").strip()
         if tval.isdigit():
             per_q_time = max(3, int(tval))
-    elif timed and platform.system() == "Windows":
+    elif timed and _IS_WINDOWS:
         print(Fore.YELLOW + "Timed mode is not supported on Windows reliably. Continuing without timeout.")
 
     # how many questions
-    max_q = len([q for q in QUESTIONS if difficulty == "all" or q["difficulty"] == difficulty])
+    max_q = len(_BUCKETS[difficulty])
     nq = input(f"How many questions? (max {max_q}, press Enter for all): ").strip()
     num_q = None
     if nq.isdigit():
@@ -273,7 +411,7 @@ def main():
         show_leaderboard()
 
     # Run quiz
-    run_quiz(user, difficulty=difficulty, timed=timed and platform.system() != "Windows", per_question_time=per_q_time, num_questions=num_q)
+    run_quiz(user, difficulty=difficulty, timed=timed and not _IS_WINDOWS, per_question_time=per_q_time, num_questions=num_q)
 
     # After quiz, option to view leaderboard
     view_lb = input("\nView leaderboard now? (y/N): ").strip().lower()